@@ -1,18 +1,16 @@
+import asyncio
+
+from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional
-
-# Initialize the app
-app = FastAPI(title="Locate918 LLM Service")
+from fastapi.responses import ORJSONResponse
 
-class ChatRequest(BaseModel):
-    message: str
-    user_id: Optional[str] = None
-    conversation_id: Optional[str] = None
+from app.models.schemas import SearchRequest
+from app.routes import chat as chat_routes
+from app.services import backend, cache, gemini, tokens
 
-class SearchRequest(BaseModel):
-    query: str
+# Initialize the app
+app = FastAPI(title="Locate918 LLM Service", default_response_class=ORJSONResponse)
 
 # Setup CORS (This allows your React frontend to talk to this Python backend)
 app.add_middleware(
@@ -23,6 +21,29 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+app.include_router(chat_routes.router)
+
+@app.on_event("startup")
+async def startup():
+    load_dotenv()
+    gemini.configure_gemini()
+    # Before anything counts tokens, so no request blocks on the download
+    await asyncio.to_thread(tokens.load_encoding)
+    # One HTTP/2 connection pool / Gemini client shared by every request
+    await gemini.open_session()
+    await cache.connect()
+    await backend.open_client()
+    await gemini.create_prompt_cache()
+    await gemini.start_intent_batcher()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await gemini.stop_intent_batcher()
+    await gemini.delete_prompt_cache()
+    await backend.close_client()
+    await cache.close()
+    await gemini.close_session()
+
 @app.get("/")
 async def root():
     return {"status": "online", "service": "Locate918 LLM"}
@@ -31,17 +52,10 @@ async def root():
 async def health_check():
     return {"status": "ok"}
 
-@app.post("/api/chat")
-async def chat(request: ChatRequest):
-    return {
-        "message": "Tully is online! (This is a placeholder response.)",
-        "events": [],
-        "conversation_id": request.conversation_id or "test"
-    }
-
 @app.post("/api/search")
 async def search(request: SearchRequest):
+    parsed = await gemini.parse_user_intent(request.query)
     return {
         "events": [],
-        "parsed": {"query": request.query}
+        "parsed": parsed
     }
\ No newline at end of file
@@ -10,8 +10,73 @@ Models to implement:
 - SearchParams: query, category, date_from, date_to, location
 - ParseIntentRequest/Response: for /api/parse-intent endpoint
 - ChatRequest/Response: for /api/chat endpoint
+- SearchRequest: for /api/search endpoint
 - Event: mirrors Rust Event struct
 - UserProfile: for personalization context
+- NormalizeRequest/Response: for /api/normalize endpoint
 """
 
-# TODO: Ben to implement
\ No newline at end of file
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class _Schema(BaseModel):
+    """Immutable request/response model; surrounding whitespace is stripped."""
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+
+
+class SearchParams(_Schema):
+    """Mirrors SearchParams in backend/src/services/llm.rs"""
+    query: Optional[str] = None
+    category: Optional[str] = None
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    location: Optional[str] = None
+    price_max: Optional[float] = None
+    outdoor: Optional[bool] = None
+    family_friendly: Optional[bool] = None
+
+
+class ParseIntentRequest(_Schema):
+    message: str
+
+
+class ParseIntentResponse(_Schema):
+    params: SearchParams
+    confidence: float = 1.0
+
+
+class SearchRequest(_Schema):
+    query: str
+
+
+class ChatRequest(_Schema):
+    """Mirrors ChatRequest in backend/src/services/llm.rs"""
+    message: str
+    user_id: Optional[str] = None
+    conversation_id: Optional[str] = None
+    events: List[Dict[str, Any]] = []
+    # Earlier turns as Gemini contents: {"role": "user" | "model", "parts": [{"text": ...}]}
+    history: List[Dict[str, Any]] = []
+
+
+class ChatResponse(_Schema):
+    """
+    reply/events/search_params are read by the Rust LlmClient;
+    message/conversation_id by the frontend (services/api.js).
+    """
+    reply: str
+    message: str
+    events: List[Dict[str, Any]] = []
+    search_params: Optional[SearchParams] = None
+    conversation_id: str
+
+
+class NormalizeRequest(_Schema):
+    raw_html: str
+    source_url: str
+
+
+class NormalizeResponse(_Schema):
+    events: List[Dict[str, Any]]
@@ -8,15 +8,134 @@ FastAPI endpoints called by the Rust backend.
 Endpoints to implement:
 - POST /api/parse-intent  → Convert natural language to SearchParams
 - POST /api/chat          → Generate conversational response about events
+- POST /api/chat/stream   → Same, streamed as Server-Sent Events
 - POST /api/normalize     → Clean up raw scraped event data (for Skylar)
 
-Request flow:
+Request flow (Rust backend):
 1. User: "Any jazz concerts this weekend?"
 2. Rust calls POST /api/parse-intent
 3. Returns: {"params": {"category": "music", "query": "jazz"}}
 4. Rust searches database
 5. Rust calls POST /api/chat with message + events
 6. Returns: {"reply": "I found 3 concerts! ..."}
+
+Request flow (no events passed, or Tully wants different ones):
+1. Tully's first turn answers, or calls search_events
+2. On a tool call we GET /api/events/search and hand the results back to
+   Tully in the same chat, as the function response
+3. Tully replies about the results
 """
 
-# TODO: Ben to implement
\ No newline at end of file
+import uuid
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.models.schemas import (
+    ChatRequest,
+    ChatResponse,
+    NormalizeRequest,
+    NormalizeResponse,
+    ParseIntentRequest,
+    ParseIntentResponse,
+    SearchParams,
+)
+from app.services import backend, gemini
+
+router = APIRouter()
+
+
+@router.post("/api/parse-intent", response_model=ParseIntentResponse)
+async def parse_intent(request: ParseIntentRequest):
+    # Concurrent calls are micro-batched into one Gemini request
+    params = await gemini.parse_user_intent(request.message)
+    return ParseIntentResponse(params=SearchParams(**params))
+
+
+@router.post("/api/normalize", response_model=NormalizeResponse)
+async def normalize(request: NormalizeRequest):
+    return NormalizeResponse(events=await gemini.normalize_events(request.raw_html, request.source_url))
+
+
+@router.post("/api/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest):
+    """
+    Chat with Tully.
+
+    Tully's first turn either answers (about the events the Rust backend
+    passed, if any) or calls search_events. We run that search against
+    the Rust backend and answer it in the same chat, so Tully replies
+    about the results; those events and the search_params are returned.
+    No separate parse-intent call is made; that stays on /api/search and
+    /api/parse-intent.
+    """
+    # Minted for the response only; history summaries are keyed by the
+    # client's id, or by the history itself when it sent none
+    conversation_id = request.conversation_id or str(uuid.uuid4())
+    user_profile = await _user_profile(request)
+
+    result = await gemini.generate_chat_response(
+        request.message,
+        request.events,
+        user_profile=user_profile,
+        history=request.history,
+        conversation_id=request.conversation_id,
+        run_search=backend.search_events,
+    )
+    search_params = result["search_params"]
+
+    return ChatResponse(
+        reply=result["reply"],
+        message=result["reply"],
+        events=request.events if result["events"] is None else result["events"],
+        search_params=SearchParams(**search_params) if search_params else None,
+        conversation_id=conversation_id,
+    )
+
+
+@router.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Stream Tully's reply as it is generated.
+
+    Tully's searches are run here as in /api/chat.
+
+    SSE events:
+    - default (message): one reply chunk, JSON-encoded string
+    - search_params: Tully called search_events with these SearchParams
+    - events: results of that search
+    - error: generation failed mid-stream
+    - done: end of reply
+    """
+    user_profile = await _user_profile(request)
+
+    async def generator():
+        try:
+            async for kind, value in gemini.generate_chat_response_stream(
+                request.message,
+                request.events,
+                user_profile=user_profile,
+                history=request.history,
+                conversation_id=request.conversation_id,
+                run_search=backend.search_events,
+            ):
+                data = orjson.dumps(value).decode()
+                if kind == "text":
+                    yield f"data: {data}\n\n"
+                else:
+                    yield f"event: {kind}\ndata: {data}\n\n"
+        except Exception as exc:
+            yield f"event: error\ndata: {orjson.dumps(str(exc)).decode()}\n\n"
+            return
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(generator(), media_type="text/event-stream")
+
+
+async def _user_profile(request: ChatRequest) -> Optional[Dict[str, Any]]:
+    """Profile for personalizing Tully, looked up by user_id."""
+    if request.user_id is None:
+        return None
+    return await backend.get_user_profile(request.user_id)
@@ -0,0 +1,102 @@
+"""
+Locate918 LLM Service - Rust Backend Client
+===========================================
+Owner: Ben (AI Engineer)
+
+Calls back into the Rust API when Tully needs to run a search itself
+(e.g. the frontend chatting with /api/chat directly, without events), and
+to load the user profile that personalizes Tully's replies.
+
+Setup:
+- BACKEND_URL in .env (default http://localhost:3000)
+
+See backend/src/routes/events.rs for GET /api/events/search and
+backend/src/routes/users.rs for GET /api/users/:id/profile.
+"""
+
+import logging
+import os
+from datetime import date
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+import httpx
+
+from app.services import local_time
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+async def open_client() -> None:
+    """Create the shared HTTP client (FastAPI startup)."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=os.getenv("BACKEND_URL", "http://localhost:3000"), timeout=10.0
+        )
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client (FastAPI shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+
+
+def _to_query(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Map SearchParams onto the Rust SearchQuery field names/formats."""
+    query = {
+        "q": params.get("query"),
+        "category": params.get("category"),
+        "location": params.get("location"),
+        "price_max": params.get("price_max"),
+        "outdoor": params.get("outdoor"),
+        "family_friendly": params.get("family_friendly"),
+    }
+    # SearchQuery takes full timestamps; SearchParams carries Tulsa days
+    # (YYYY-MM-DD), so "tonight" runs to local midnight, not UTC's
+    date_from = _day(params.get("date_from"))
+    if date_from is not None:
+        query["start_date"] = local_time.day_start(date_from).isoformat()
+    date_to = _day(params.get("date_to"))
+    if date_to is not None:
+        query["end_date"] = local_time.day_end(date_to).isoformat()
+    return {k: v for k, v in query.items() if v is not None}
+
+
+def _day(value: Optional[str]) -> Optional[date]:
+    try:
+        return date.fromisoformat(value[:10]) if value else None
+    except ValueError:
+        logger.warning("Ignoring unparseable date in SearchParams: %r", value)
+        return None
+
+
+async def search_events(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """GET /api/events/search with the given SearchParams."""
+    if _client is None:
+        raise RuntimeError("Backend client not initialized; call open_client() first")
+    response = await _client.get("/api/events/search", params=_to_query(params))
+    response.raise_for_status()
+    return response.json()
+
+
+async def get_user_profile(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    GET /api/users/:id/profile, or None if the user is unknown or the
+    backend can't be reached; chat works without personalization.
+    """
+    if _client is None:
+        raise RuntimeError("Backend client not initialized; call open_client() first")
+    try:
+        response = await _client.get(f"/api/users/{quote(user_id, safe='')}/profile")
+        if response.status_code == httpx.codes.NOT_FOUND:
+            return None
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        logger.warning("Failed to load profile for user %s: %s", user_id, exc)
+        return None
+    return response.json()
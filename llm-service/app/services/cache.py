@@ -0,0 +1,148 @@
+"""
+Locate918 LLM Service - Response Cache
+======================================
+Owner: Ben (AI Engineer)
+
+Two-tier cache for Gemini results that are deterministic in their input
+(parse_user_intent, normalize_events). A hit skips the Gemini call entirely.
+
+Tiers:
+1. In-process TTLCache (per worker)
+2. Redis, shared by all workers - only used when REDIS_URL is set
+
+Usage:
+    @cached("intent", lambda message: message.strip().lower())
+    async def parse_user_intent(message): ...
+
+Only successful dict/list results are stored; exceptions (e.g. Gemini
+returning invalid JSON) are never cached.
+
+Misses are single-flight: concurrent callers with the same key share one
+in-flight call instead of each hitting Gemini.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import orjson
+import xxhash
+from blake3 import blake3
+from cachetools import TTLCache
+
+CACHE_TTL_SECONDS = 3600
+CACHE_MAX_ENTRIES = 10_000
+
+# Inputs shorter than this (user messages) are keyed with xxh3; longer
+# ones (scraped pages) with BLAKE3, multithreaded once they are large
+# enough for that to pay off.
+SHORT_KEY_BYTES = 1024
+BLAKE3_THREADED_BYTES = 1 << 20
+
+logger = logging.getLogger(__name__)
+
+_local: TTLCache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+_redis: Optional[Any] = None
+_inflight: Dict[str, "asyncio.Task[bytes]"] = {}
+
+
+async def connect() -> None:
+    """Connect to Redis if REDIS_URL is set (FastAPI startup)."""
+    global _redis
+    url = os.getenv("REDIS_URL")
+    if not url or _redis is not None:
+        return
+    import redis.asyncio as aioredis
+
+    _redis = aioredis.from_url(url)
+
+
+async def close() -> None:
+    """Close the Redis connection (FastAPI shutdown)."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+    _redis = None
+
+
+def make_key(namespace: str, raw: str) -> str:
+    data = raw.encode()
+    if len(data) < SHORT_KEY_BYTES:
+        digest = xxhash.xxh3_128_hexdigest(data)
+    elif len(data) < BLAKE3_THREADED_BYTES:
+        digest = blake3(data).hexdigest(length=16)
+    else:
+        digest = blake3(data, max_threads=blake3.AUTO).hexdigest(length=16)
+    return f"locate918:{namespace}:{digest}"
+
+
+async def lookup(key: str) -> Any:
+    # Values are kept as JSON bytes so callers always get a fresh copy
+    data = _local.get(key)
+    if data is None and _redis is not None:
+        try:
+            data = await _redis.get(key)
+        except Exception as exc:
+            logger.warning("Redis get failed for %s: %s", key, exc)
+        if data is not None:
+            _local[key] = data
+    return orjson.loads(data) if data is not None else None
+
+
+async def store(key: str, value: Any) -> None:
+    if isinstance(value, (dict, list)):
+        await _store_bytes(key, orjson.dumps(value))
+
+
+async def _store_bytes(key: str, data: bytes) -> None:
+    _local[key] = data
+    if _redis is None:
+        return
+    try:
+        await _redis.setex(key, CACHE_TTL_SECONDS, data)
+    except Exception as exc:
+        logger.warning("Redis set failed for %s: %s", key, exc)
+
+
+def cached(
+    namespace: str, key_fn: Callable[..., str]
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Cache an async function's result under make_key(namespace, key_fn(*args))."""
+
+    def decorator(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        async def fill(key: str, args: Any, kwargs: Any) -> bytes:
+            value = await fn(*args, **kwargs)
+            data = orjson.dumps(value)
+            if isinstance(value, (dict, list)):
+                await _store_bytes(key, data)
+            return data
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = make_key(namespace, key_fn(*args, **kwargs))
+            value = await lookup(key)
+            if value is not None:
+                return value
+
+            task = _inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(fill(key, args, kwargs))
+                _inflight[key] = task
+                task.add_done_callback(functools.partial(_finish_inflight, key))
+            # Shielded so one caller disconnecting doesn't cancel the others
+            data = await asyncio.shield(task)
+            return orjson.loads(data)
+
+        return wrapper
+
+    return decorator
+
+
+def _finish_inflight(key: str, task: "asyncio.Task[bytes]") -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        # Mark the exception retrieved even if every waiter went away
+        task.exception()
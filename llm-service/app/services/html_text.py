@@ -0,0 +1,64 @@
+"""
+Locate918 LLM Service - HTML Cleanup
+====================================
+Owner: Ben (AI Engineer)
+
+Turns scraped pages into the text Gemini actually needs before
+normalization. Typical event pages are mostly scripts, styles and
+navigation; dropping them cuts prompt tokens (and cost/latency) by an
+order of magnitude.
+
+schema.org JSON-LD blocks are kept: many ticketing sites publish their
+events there in structured form.
+"""
+
+import re
+
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+# Never useful for event extraction
+_BOILERPLATE_TAGS = [
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe",
+]
+
+# Site chrome when page-level, but inside <main>/<article> a <header> often
+# holds the event's title and date, so those are kept
+_LANDMARK_TAGS = frozenset({"nav", "header", "footer", "aside", "form"})
+_CONTENT_TAGS = frozenset({"main", "article"})
+
+_WHITESPACE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+def extract_visible_text(raw_html: str) -> str:
+    """Visible text of the page's <main> (or <body>), plus any JSON-LD."""
+    tree = LexborHTMLParser(raw_html)
+
+    json_ld = [
+        node.text(deep=True).strip()
+        for node in tree.css('script[type="application/ld+json"]')
+    ]
+
+    tree.strip_tags(_BOILERPLATE_TAGS)
+    for node in tree.css(", ".join(sorted(_LANDMARK_TAGS))):
+        if _is_page_landmark(node):
+            node.decompose()
+    root = tree.css_first("main") or tree.body or tree.root
+    text = root.text(separator="\n") if root is not None else ""
+
+    text = _WHITESPACE.sub(" ", text)
+    text = _BLANK_LINES.sub("\n", text).strip()
+
+    if json_ld:
+        text = "\n".join(block for block in json_ld if block) + "\n\n" + text
+    return text
+
+
+def _is_page_landmark(node: LexborNode) -> bool:
+    """True unless node sits inside content, or inside a landmark removed anyway."""
+    parent = node.parent
+    while parent is not None:
+        if parent.tag in _CONTENT_TAGS or parent.tag in _LANDMARK_TAGS:
+            return False
+        parent = parent.parent
+    return True
@@ -0,0 +1,141 @@
+"""
+Locate918 LLM Service - Rule-Based Intent Parsing
+=================================================
+Owner: Ben (AI Engineer)
+
+Fast path for parse_user_intent. Short, common queries ("jazz tonight",
+"family events downtown this weekend") are parsed with precompiled
+regexes so they never reach Gemini.
+
+A query is only handled here if every word is accounted for, either by
+a rule or as filler ("any", "events", "what's"...). Anything else,
+such as "jazz near the river under $30 with parking", returns None and
+goes to Gemini.
+"""
+
+import re
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+
+# phrase → (category, query); either may be None
+_TOPICS = {
+    "concerts": ("concerts", None),
+    "concert": ("concerts", None),
+    "live music": ("concerts", None),
+    "music": ("concerts", None),
+    "jazz": ("concerts", "jazz"),
+    "rock": ("concerts", "rock"),
+    "blues": ("concerts", "blues"),
+    "country": ("concerts", "country"),
+    "hip hop": ("concerts", "hip hop"),
+    "sports": ("sports", None),
+    "games": ("sports", None),
+    "comedy": ("comedy", None),
+    "stand up": ("comedy", None),
+    "nightlife": ("nightlife", None),
+    "bars": ("nightlife", None),
+    "food trucks": (None, "food trucks"),
+    "food": (None, "food"),
+    "art": (None, "art"),
+}
+
+_LOCATIONS = {
+    "downtown": "Downtown",
+    "broken arrow": "Broken Arrow",
+    "south tulsa": "South Tulsa",
+    "brookside": "Brookside",
+    "the pearl": "Pearl District",
+    "pearl district": "Pearl District",
+    "blue dome": "Blue Dome District",
+}
+
+_DATES = ("tonight", "today", "tomorrow", "this weekend")
+
+_FILLER = frozenset("""
+    a an any anything are event events find for fun going happening in is
+    me near on or show shows some something stuff the there things to what whats
+    where with around get good at
+""".split())
+
+
+def _alternation(phrases) -> str:
+    # Longest first so "food trucks" wins over "food"
+    return "|".join(re.escape(p) for p in sorted(phrases, key=len, reverse=True))
+
+
+_TOPIC_RE = re.compile(rf"\b({_alternation(_TOPICS)})\b")
+_LOCATION_RE = re.compile(rf"\b({_alternation(_LOCATIONS)})\b")
+_DATE_RE = re.compile(rf"\b({_alternation(_DATES)})\b")
+_FAMILY_RE = re.compile(r"\b(family friendly|kid friendly|for kids|family|kids)\b")
+_OUTDOOR_RE = re.compile(r"\b(outdoors?|outside)\b")
+_FREE_RE = re.compile(r"\bfree\b")
+_PRICE_RE = re.compile(r"\b(?:under|below|less than) \$?(\d+(?:\.\d+)?)\b")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Returned by take() when a pattern matches more than once
+_AMBIGUOUS: Any = object()
+
+
+def _date_range(phrase: str, today: date) -> Dict[str, str]:
+    if phrase in ("tonight", "today"):
+        start = end = today
+    elif phrase == "tomorrow":
+        start = end = today + timedelta(days=1)
+    else:  # this weekend: Saturday-Sunday, or what's left of it
+        saturday = today + timedelta(days=(5 - today.weekday()) % 7)
+        start = today if today.weekday() >= 5 else saturday
+        end = saturday + timedelta(days=1) if today.weekday() < 6 else today
+    return {"date_from": start.isoformat(), "date_to": end.isoformat()}
+
+
+def match_intent(message: str, today: date) -> Optional[Dict[str, Any]]:
+    """SearchParams for message, or None if the rules don't fully cover it."""
+    text = message.lower().replace("'", "").replace("-", " ")
+    params: Dict[str, Any] = {
+        "query": None, "category": None, "date_from": None, "date_to": None,
+        "location": None, "price_max": None, "outdoor": None, "family_friendly": None,
+    }
+    matched = False
+
+    def take(pattern: "re.Pattern[str]") -> Optional["re.Match[str]"]:
+        nonlocal text, matched
+        found = list(pattern.finditer(text))
+        if len(found) != 1:
+            # Two topics or two dates is more than the rules can express
+            return None if not found else _AMBIGUOUS
+        match = found[0]
+        text = text[: match.start()] + " " + text[match.end():]
+        matched = True
+        return match
+
+    topic = take(_TOPIC_RE)
+    location = take(_LOCATION_RE)
+    when = take(_DATE_RE)
+    family = take(_FAMILY_RE)
+    outdoor = take(_OUTDOOR_RE)
+    free = take(_FREE_RE)
+    price = take(_PRICE_RE)
+    if _AMBIGUOUS in (topic, location, when, family, outdoor, free, price):
+        return None
+    if free and price:
+        # "free ... under $20" contradicts itself; let Gemini sort it out
+        return None
+
+    if not matched or any(word not in _FILLER for word in _WORD_RE.findall(text)):
+        return None
+
+    if topic:
+        params["category"], params["query"] = _TOPICS[topic.group(1)]
+    if location:
+        params["location"] = _LOCATIONS[location.group(1)]
+    if when:
+        params.update(_date_range(when.group(1), today))
+    if family:
+        params["family_friendly"] = True
+    if outdoor:
+        params["outdoor"] = True
+    if free:
+        params["price_max"] = 0.0
+    if price:
+        params["price_max"] = float(price.group(1))
+    return params
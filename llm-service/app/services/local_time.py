@@ -0,0 +1,27 @@
+"""
+Locate918 LLM Service - Local Time
+==================================
+Owner: Ben (AI Engineer)
+
+Tulsa's calendar. "Today", "tonight" and SearchParams date ranges are
+Tulsa days whatever zone the server runs in, and become offset-aware
+timestamps before they reach the Rust backend (events.start_time is a
+TIMESTAMPTZ).
+"""
+
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo
+
+TULSA_TZ = ZoneInfo("America/Chicago")
+
+
+def today() -> date:
+    return datetime.now(TULSA_TZ).date()
+
+
+def day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=TULSA_TZ)
+
+
+def day_end(day: date) -> datetime:
+    return datetime.combine(day, time(23, 59, 59), tzinfo=TULSA_TZ)
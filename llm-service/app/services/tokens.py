@@ -0,0 +1,55 @@
+"""
+Locate918 LLM Service - Token Counting
+======================================
+Owner: Ben (AI Engineer)
+
+Approximate token counts for prompt budgeting.
+
+Gemini's tokenizer isn't available locally, so we use tiktoken's
+cl100k_base as a close stand-in. tiktoken downloads its BPE file on first
+use, so load_encoding runs at startup, off the event loop; if the download
+fails (e.g. no network in the container) we fall back to ~4 characters per
+token.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Optional[Any]:
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as exc:
+        logger.warning("tiktoken unavailable, estimating tokens from length: %s", exc)
+        return None
+
+
+def load_encoding() -> None:
+    """Load the encoding, downloading it if needed (FastAPI startup)."""
+    _encoding()
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Return the longest prefix of text that fits in max_tokens."""
+    encoding = _encoding()
+    if encoding is None:
+        return text[: max_tokens * CHARS_PER_TOKEN]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
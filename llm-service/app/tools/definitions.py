@@ -0,0 +1,39 @@
+"""
+Locate918 LLM Service - Tool Definitions
+========================================
+Owner: Ben (AI Engineer)
+
+Tool schemas Tully can call during a chat.
+
+Tools:
+- search_events: find events matching SearchParams (executed by the Rust backend)
+
+The google-genai types are built and validated once at import and shared
+by every chat config and the prompt cache; nothing rebuilds them per
+request.
+"""
+
+from google.genai import types
+
+# Mirrors SearchParams in backend/src/services/llm.rs
+search_events_tool_schema = {
+    "name": "search_events",
+    "description": "Search for events in the Tulsa area",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "query": {"type": "string", "description": "Text to search for in titles/descriptions"},
+            "category": {"type": "string", "description": "e.g. concerts, sports, family, comedy, nightlife"},
+            "date_from": {"type": "string", "description": "Start of date range (YYYY-MM-DD)"},
+            "date_to": {"type": "string", "description": "End of date range (YYYY-MM-DD)"},
+            "location": {"type": "string", "description": "e.g. Downtown, Broken Arrow"},
+            "price_max": {"type": "number", "description": "Maximum ticket price"},
+            "outdoor": {"type": "boolean", "description": "Only outdoor events"},
+            "family_friendly": {"type": "boolean", "description": "Only family-friendly events"},
+        },
+    },
+}
+
+SEARCH_EVENTS_DECLARATION = types.FunctionDeclaration.model_validate(search_events_tool_schema)
+
+gemini_tools = [types.Tool(function_declarations=[SEARCH_EVENTS_DECLARATION])]
@@ -0,0 +1,132 @@
+"""
+Shared fixtures for the LLM service tests.
+
+Neither Gemini nor the Rust backend is called for real: gemini_stub and
+backend_stub swap each module's client for one whose HTTP transport is an
+httpx.MockTransport serving canned replies.
+"""
+
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+import httpx
+import orjson
+import pytest
+from google import genai
+from google.genai import types
+
+from app.services import backend, cache, gemini
+
+Parts = List[Dict[str, Any]]
+Reply = Union[Parts, Callable[[str], Parts]]
+
+
+def text_part(text: str) -> Dict[str, Any]:
+    return {"text": text}
+
+
+def call_part(name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+    return {"functionCall": {"name": name, "args": args}}
+
+
+class GeminiStub:
+    """
+    Serves queued replies in order, one per generateContent request.
+
+    A reply is a list of parts, or a callable taking the prompt text (the
+    last user turn) and returning one. Every request body is recorded.
+    CachedContent calls are answered with a fixed cache and recorded in
+    cache_requests as (method, path).
+    """
+
+    cache_name = "cachedContents/stub"
+
+    def __init__(self) -> None:
+        self.replies: List[Reply] = []
+        self.requests: List[Dict[str, Any]] = []
+        self.cache_requests: List[Tuple[str, str]] = []
+
+    def reply(self, *parts: Dict[str, Any]) -> None:
+        self.replies.append(list(parts))
+
+    def reply_json(self, value: Any) -> None:
+        self.reply(text_part(orjson.dumps(value).decode()))
+
+    def reply_with(self, fn: Callable[[str], Parts]) -> None:
+        self.replies.append(fn)
+
+    def prompts(self) -> List[str]:
+        return [prompt_text(body) for body in self.requests]
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if "cachedContents" in request.url.path:
+            self.cache_requests.append((request.method, request.url.path))
+            return httpx.Response(200, json={"name": self.cache_name, "model": "models/gemini-2.0-flash"})
+        body = orjson.loads(request.content)
+        self.requests.append(body)
+        if not self.replies:
+            return httpx.Response(500, json={"error": {"code": 500, "message": "no stub reply queued"}})
+        reply = self.replies.pop(0)
+        parts = reply(prompt_text(body)) if callable(reply) else reply
+        payload = {"candidates": [{"content": {"role": "model", "parts": parts}}]}
+        if "streamGenerateContent" in request.url.path:
+            return httpx.Response(
+                200,
+                content=f"data: {orjson.dumps(payload).decode()}\n\n".encode(),
+                headers={"content-type": "text/event-stream"},
+            )
+        return httpx.Response(200, json=payload)
+
+
+class BackendStub:
+    """
+    Stands in for the Rust API. responses maps a raw request path (no query
+    string) to the response for it; anything else is a 404. Every request
+    is recorded.
+    """
+
+    def __init__(self) -> None:
+        self.responses: Dict[str, httpx.Response] = {}
+        self.requests: List[httpx.Request] = []
+
+    def searches(self) -> List[Dict[str, str]]:
+        """Query params of each GET /api/events/search, in order."""
+        return [dict(r.url.params) for r in self.requests if r.url.path == "/api/events/search"]
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.responses.get(request.url.raw_path.split(b"?")[0].decode())
+        if response is None:
+            return httpx.Response(404)
+        # A fresh copy each time, so one path can be requested repeatedly
+        return httpx.Response(response.status_code, headers=response.headers, content=response.content)
+
+
+def prompt_text(body: Dict[str, Any]) -> str:
+    last = body["contents"][-1]
+    return " ".join(part.get("text", "") for part in last["parts"])
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache._local.clear()
+    cache._inflight.clear()
+    yield
+    cache._local.clear()
+    cache._inflight.clear()
+
+
+@pytest.fixture
+def gemini_stub(monkeypatch) -> GeminiStub:
+    stub = GeminiStub()
+    http = httpx.AsyncClient(transport=httpx.MockTransport(stub.handler))
+    client = genai.Client(api_key="test", http_options=types.HttpOptions(httpx_async_client=http))
+    monkeypatch.setattr(gemini, "_client", client)
+    return stub
+
+
+@pytest.fixture
+def backend_stub(monkeypatch) -> BackendStub:
+    stub = BackendStub()
+    http = httpx.AsyncClient(base_url="http://backend", transport=httpx.MockTransport(stub.handler))
+    monkeypatch.setattr(backend, "_client", http)
+    return stub
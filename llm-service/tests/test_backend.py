@@ -0,0 +1,80 @@
+import asyncio
+
+import httpx
+
+from app.services import backend
+
+
+def test_to_query_maps_search_params_onto_rust_names():
+    query = backend._to_query({
+        "query": "jazz",
+        "category": "concerts",
+        "date_from": "2024-06-07",
+        "date_to": "2024-06-09",
+        "location": "Downtown",
+        "price_max": 0.0,
+        "outdoor": False,
+        "family_friendly": None,
+    })
+
+    assert query == {
+        "q": "jazz",
+        "category": "concerts",
+        "start_date": "2024-06-07T00:00:00-05:00",
+        "end_date": "2024-06-09T23:59:59-05:00",
+        "location": "Downtown",
+        "price_max": 0.0,
+        "outdoor": False,
+    }
+
+
+def test_to_query_truncates_datetimes_to_whole_days():
+    query = backend._to_query({"date_from": "2024-06-07T18:00:00", "date_to": "2024-06-07T22:00:00"})
+
+    assert query == {"start_date": "2024-06-07T00:00:00-05:00", "end_date": "2024-06-07T23:59:59-05:00"}
+
+
+def test_to_query_days_are_tulsa_days_across_dst():
+    query = backend._to_query({"date_from": "2024-01-12", "date_to": "2024-01-12"})
+
+    # Central Standard Time in winter; an 8pm show is 02:00 UTC the next day
+    assert query == {"start_date": "2024-01-12T00:00:00-06:00", "end_date": "2024-01-12T23:59:59-06:00"}
+
+
+def test_to_query_ignores_unparseable_dates():
+    assert backend._to_query({"query": "jazz", "date_from": "this weekend"}) == {"q": "jazz"}
+
+
+def test_to_query_drops_unset_params():
+    assert backend._to_query({}) == {}
+
+
+PROFILE = {"user": {"name": "Sam"}, "preferences": [{"category": "concerts", "weight": 2}]}
+
+
+def test_search_events_sends_the_mapped_query(backend_stub):
+    backend_stub.responses["/api/events/search"] = httpx.Response(200, json=[{"title": "Jazz Night"}])
+
+    events = asyncio.run(backend.search_events({"query": "jazz", "outdoor": True}))
+
+    assert events == [{"title": "Jazz Night"}]
+    assert backend_stub.searches() == [{"q": "jazz", "outdoor": "true"}]
+
+
+def test_get_user_profile(backend_stub):
+    backend_stub.responses["/api/users/u1/profile"] = httpx.Response(200, json=PROFILE)
+
+    assert asyncio.run(backend.get_user_profile("u1")) == PROFILE
+
+
+def test_get_user_profile_unknown_or_failing_user_is_none(backend_stub):
+    backend_stub.responses["/api/users/broken/profile"] = httpx.Response(500)
+
+    assert asyncio.run(backend.get_user_profile("nobody")) is None
+    assert asyncio.run(backend.get_user_profile("broken")) is None
+
+
+def test_get_user_profile_escapes_the_id(backend_stub):
+    backend_stub.responses["/api/users/..%2Fevents/profile"] = httpx.Response(200, json=PROFILE)
+
+    assert asyncio.run(backend.get_user_profile("../events")) == PROFILE
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from app.services import cache
+
+
+def counting(fn=None):
+    """@cached function that records each call and waits on a gate."""
+    calls = []
+
+    @cache.cached("test", lambda key, gate=None: key)
+    async def lookup(key, gate=None):
+        calls.append(key)
+        if gate is not None:
+            await gate.wait()
+        if fn is not None:
+            return fn(key)
+        return {"key": key}
+
+    return lookup, calls
+
+
+def test_concurrent_misses_share_one_call():
+    lookup, calls = counting()
+
+    async def main():
+        gate = asyncio.Event()
+        waiters = [asyncio.create_task(lookup("jazz", gate)) for _ in range(5)]
+        await asyncio.sleep(0)
+        gate.set()
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(main()) == [{"key": "jazz"}] * 5
+    assert calls == ["jazz"]
+    assert cache._inflight == {}
+
+
+def test_hits_skip_the_call_and_return_copies():
+    lookup, calls = counting()
+
+    async def main():
+        first = await lookup("jazz")
+        first["key"] = "mutated"
+        return await lookup("jazz")
+
+    assert asyncio.run(main()) == {"key": "jazz"}
+    assert calls == ["jazz"]
+
+
+def test_distinct_keys_are_not_shared():
+    lookup, calls = counting()
+
+    async def main():
+        return await asyncio.gather(lookup("jazz"), lookup("rodeo"))
+
+    assert asyncio.run(main()) == [{"key": "jazz"}, {"key": "rodeo"}]
+    assert sorted(calls) == ["jazz", "rodeo"]
+
+
+def test_exceptions_are_not_cached():
+    failures = [ValueError("bad json")]
+
+    def result(key):
+        if failures:
+            raise failures.pop()
+        return {"key": key}
+
+    lookup, calls = counting(result)
+
+    with pytest.raises(ValueError):
+        asyncio.run(lookup("jazz"))
+    assert asyncio.run(lookup("jazz")) == {"key": "jazz"}
+    assert calls == ["jazz", "jazz"]
+
+
+def test_non_container_results_are_not_cached():
+    lookup, calls = counting(lambda key: None)
+
+    asyncio.run(lookup("jazz"))
+    asyncio.run(lookup("jazz"))
+
+    assert calls == ["jazz", "jazz"]
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    lookup, calls = counting()
+
+    async def main():
+        gate = asyncio.Event()
+        leaver = asyncio.create_task(lookup("jazz", gate))
+        stayer = asyncio.create_task(lookup("jazz", gate))
+        await asyncio.sleep(0)
+        leaver.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leaver
+        return await stayer
+
+    assert asyncio.run(main()) == {"key": "jazz"}
+    assert calls == ["jazz"]
+
+
+def test_make_key_is_namespaced_and_fixed_width():
+    short = cache.make_key("intent", "jazz tonight")
+    long = cache.make_key("normalize", "x" * (cache.SHORT_KEY_BYTES + 1))
+    huge = cache.make_key("normalize", "x" * cache.BLAKE3_THREADED_BYTES)
+
+    assert short.startswith("locate918:intent:")
+    assert long.startswith("locate918:normalize:")
+    assert len({len(short.rsplit(":", 1)[1]), len(long.rsplit(":", 1)[1]), len(huge.rsplit(":", 1)[1])}) == 1
+    assert cache.make_key("intent", "jazz tonight") == short
+    assert cache.make_key("normalize", "jazz tonight") != short
@@ -0,0 +1,9 @@
+from app.services import gemini
+
+
+def test_normalize_key_separates_url_from_html():
+    assert gemini._normalize_cache_key("<p>x", "u/a") != gemini._normalize_cache_key("x", "u/a<p>")
+
+
+def test_normalize_key_is_stable():
+    assert gemini._normalize_cache_key("<p>x", "u/a") == gemini._normalize_cache_key("<p>x", "u/a")
@@ -0,0 +1,132 @@
+import httpx
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import gemini
+from tests.conftest import call_part, text_part
+
+EVENTS = [{"title": "Jazz Night", "venue": "Cain's Ballroom", "start_time": "2024-06-07T20:00:00Z"}]
+
+
+@pytest.fixture
+def backend_stub(backend_stub):
+    backend_stub.responses["/api/events/search"] = httpx.Response(200, json=EVENTS)
+    return backend_stub
+
+
+@pytest.fixture
+def client():
+    # Not entered as a context manager, so startup (real Gemini client) is skipped
+    return TestClient(app)
+
+
+def test_chat_answers_without_searching(client, gemini_stub, backend_stub):
+    gemini_stub.reply(text_part("Hi! What are you in the mood for?"))
+
+    body = client.post("/api/chat", json={"message": "hello"}).json()
+
+    assert body["reply"] == "Hi! What are you in the mood for?"
+    assert body["events"] == []
+    assert body["search_params"] is None
+    assert backend_stub.searches() == []
+    assert len(gemini_stub.requests) == 1
+
+
+def test_chat_runs_search_and_answers_in_the_same_chat(client, gemini_stub, backend_stub):
+    gemini_stub.reply(call_part("search_events", {"query": "jazz", "category": "concerts"}))
+    gemini_stub.reply(text_part("Jazz Night is at Cain's on Friday!"))
+
+    body = client.post("/api/chat", json={"message": "any jazz?"}).json()
+
+    assert body["reply"] == "Jazz Night is at Cain's on Friday!"
+    assert body["events"] == EVENTS
+    assert body["search_params"]["query"] == "jazz"
+    assert backend_stub.searches() == [{"q": "jazz", "category": "concerts"}]
+
+    follow_up = gemini_stub.requests[1]
+    parts = [part for content in follow_up["contents"] for part in content["parts"]]
+    assert parts[-2]["functionCall"]["name"] == "search_events"
+    assert parts[-1]["functionResponse"] == {"name": "search_events", "response": {"events": EVENTS}}
+    assert follow_up["toolConfig"]["functionCallingConfig"]["mode"] == "NONE"
+
+
+def test_chat_with_events_answers_from_them(client, gemini_stub, backend_stub):
+    gemini_stub.reply(text_part("Jazz Night at Cain's is your best bet."))
+
+    body = client.post("/api/chat", json={"message": "which one?", "events": EVENTS}).json()
+
+    assert body["reply"] == "Jazz Night at Cain's is your best bet."
+    assert body["events"] == EVENTS
+    assert body["search_params"] is None
+    assert backend_stub.searches() == []
+    assert "Jazz Night" in gemini_stub.prompts()[0]
+
+
+def test_chat_with_events_runs_a_different_search_tully_asks_for(client, gemini_stub, backend_stub):
+    gemini_stub.reply(call_part("search_events", {"query": "blues"}))
+    gemini_stub.reply(text_part("No blues this week, but Jazz Night is close!"))
+    passed = [{"title": "Rock Show"}]
+
+    body = client.post("/api/chat", json={"message": "blues instead?", "events": passed}).json()
+
+    assert body["reply"] == "No blues this week, but Jazz Night is close!"
+    assert body["search_params"]["query"] == "blues"
+    assert body["events"] == EVENTS
+    assert backend_stub.searches() == [{"q": "blues"}]
+    assert gemini_stub.requests[1]["toolConfig"]["functionCallingConfig"]["mode"] == "NONE"
+
+
+def sse_events(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields.get("event", "message"), orjson.loads(fields["data"])))
+    return events
+
+
+def test_chat_stream_runs_search_and_streams_the_reply(client, gemini_stub, backend_stub):
+    gemini_stub.reply(call_part("search_events", {"query": "jazz"}))
+    gemini_stub.reply(text_part("Jazz Night is on Friday!"))
+
+    response = client.post("/api/chat/stream", json={"message": "any jazz?"})
+
+    assert sse_events(response.text) == [
+        ("search_params", {"query": "jazz"}),
+        ("events", EVENTS),
+        ("message", "Jazz Night is on Friday!"),
+        ("done", {}),
+    ]
+    assert backend_stub.searches() == [{"q": "jazz"}]
+    assert gemini_stub.requests[1]["toolConfig"]["functionCallingConfig"]["mode"] == "NONE"
+
+
+def test_chat_stream_with_events_runs_a_different_search_tully_asks_for(client, gemini_stub, backend_stub):
+    gemini_stub.reply(call_part("search_events", {"query": "blues"}))
+    gemini_stub.reply(text_part("Jazz Night is close!"))
+
+    response = client.post("/api/chat/stream", json={"message": "blues?", "events": [{"title": "Rock Show"}]})
+
+    assert sse_events(response.text) == [
+        ("search_params", {"query": "blues"}),
+        ("events", EVENTS),
+        ("message", "Jazz Night is close!"),
+        ("done", {}),
+    ]
+    assert backend_stub.searches() == [{"q": "blues"}]
+
+
+def test_chat_without_conversation_id_gets_one_but_summaries_are_keyed_by_history(client, monkeypatch):
+    seen = []
+
+    async def generate_chat_response(message, events, **kwargs):
+        seen.append(kwargs["conversation_id"])
+        return {"reply": "Hi!", "search_params": None, "events": None}
+
+    monkeypatch.setattr(gemini, "generate_chat_response", generate_chat_response)
+
+    body = client.post("/api/chat", json={"message": "hello"}).json()
+
+    assert body["conversation_id"]
+    assert seen == [None]
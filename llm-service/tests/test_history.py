@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from app.services import gemini
+from tests.conftest import text_part
+
+WORDS_PER_CONTENT = 10
+
+
+@pytest.fixture(autouse=True)
+def small_budget(monkeypatch):
+    # One token per word, and a budget of five user/model turns
+    monkeypatch.setattr(gemini, "count_tokens", lambda text: len(text.split()))
+    monkeypatch.setattr(gemini, "MAX_HISTORY_TOKENS", 100)
+    monkeypatch.setattr(gemini, "SUMMARY_CHUNK_TURNS", 4)
+
+
+def conversation(turns):
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "parts": [{"text": " ".join([f"q{i}"] * WORDS_PER_CONTENT)}]})
+        history.append({"role": "model", "parts": [{"text": " ".join([f"a{i}"] * WORDS_PER_CONTENT)}]})
+    return history
+
+
+def trim(history, conversation_id="c1"):
+    return asyncio.run(gemini._trim_history(history, conversation_id))
+
+
+def test_history_within_budget_is_unchanged(gemini_stub):
+    history = conversation(5)
+
+    assert trim(history) is history
+    assert gemini_stub.requests == []
+
+
+def test_over_budget_history_keeps_recent_turns_after_a_summary(gemini_stub):
+    gemini_stub.reply(text_part("User wants jazz."))
+
+    trimmed = trim(conversation(6))
+
+    assert trimmed[0]["parts"][0]["text"] == "Summary of our conversation so far: User wants jazz."
+    assert trimmed[2:] == conversation(6)[8:]
+    assert "q3" in gemini_stub.prompts()[0]
+    assert "q4" not in gemini_stub.prompts()[0]
+
+
+def test_summary_is_reused_and_extended_as_the_conversation_grows(gemini_stub):
+    gemini_stub.reply(text_part("First four turns."))
+    gemini_stub.reply(text_part("First eight turns."))
+
+    trimmed = [trim(conversation(turns)) for turns in range(6, 10)]
+
+    # The cut stays after turn 4 until turn 8 is reached: one call, then one update
+    assert len(gemini_stub.requests) == 2
+    assert [t[0]["parts"][0]["text"] for t in trimmed] == [
+        "Summary of our conversation so far: First four turns.",
+        "Summary of our conversation so far: First four turns.",
+        "Summary of our conversation so far: First four turns.",
+        "Summary of our conversation so far: First eight turns.",
+    ]
+    update = gemini_stub.prompts()[1]
+    assert "First four turns." in update
+    assert "q4" in update and "q7" in update
+    assert "q3" not in update and "q8" not in update
+    assert trimmed[-1][2:] == conversation(9)[16:]
+
+
+def test_without_conversation_id_the_summary_is_still_reused_and_extended(gemini_stub):
+    gemini_stub.reply(text_part("First four turns."))
+    gemini_stub.reply(text_part("First eight turns."))
+
+    for turns in range(6, 10):
+        trim(conversation(turns), None)
+
+    assert len(gemini_stub.requests) == 2
+    assert "First four turns." in gemini_stub.prompts()[1]
+
+
+def test_kept_history_starts_on_a_user_turn(gemini_stub):
+    gemini_stub.reply(text_part("Summary."))
+    history = [{"role": "model", "parts": [{"text": "Welcome!"}]}] + conversation(6)
+
+    trimmed = trim(history)
+
+    assert trimmed[2]["role"] == "user"
+    assert trimmed[2:] == history[9:]
+
+
+def test_too_few_turns_to_fold_are_sent_as_is(gemini_stub, monkeypatch):
+    monkeypatch.setattr(gemini, "MAX_HISTORY_TOKENS", 30)
+    history = conversation(3)
+
+    assert trim(history) is history
+    assert gemini_stub.requests == []
+
+
+def test_failed_summary_drops_the_older_turns(gemini_stub):
+    # No reply queued: the stub answers 500
+    assert trim(conversation(6)) == conversation(6)[8:]
+
+
+def test_reused_conversation_id_does_not_leak_another_summary(gemini_stub):
+    gemini_stub.reply(text_part("Sam wants jazz."))
+    gemini_stub.reply(text_part("Alex wants rodeos."))
+    other = [{"role": c["role"], "parts": [{"text": "rodeo " + c["parts"][0]["text"]}]} for c in conversation(6)]
+
+    trim(conversation(6), "shared")
+    trimmed = trim(other, "shared")
+
+    assert trimmed[0]["parts"][0]["text"] == "Summary of our conversation so far: Alex wants rodeos."
+    assert len(gemini_stub.requests) == 2
+    assert "Sam wants jazz." not in gemini_stub.prompts()[1]
+
+
+def test_edited_history_is_summarized_again(gemini_stub):
+    gemini_stub.reply(text_part("First four turns."))
+    gemini_stub.reply(text_part("Edited four turns."))
+    edited = conversation(6)
+    edited[0] = {"role": "user", "parts": [{"text": "something else entirely"}]}
+
+    trim(conversation(6))
+    trimmed = trim(edited)
+
+    assert trimmed[0]["parts"][0]["text"] == "Summary of our conversation so far: Edited four turns."
+    assert "First four turns." not in gemini_stub.prompts()[1]
+
+
+def test_shorter_history_than_the_summary_is_summarized_again(gemini_stub):
+    gemini_stub.reply(text_part("First eight turns."))
+    gemini_stub.reply(text_part("First four turns."))
+
+    trim(conversation(9))
+    trimmed = trim(conversation(6))
+
+    assert trimmed[0]["parts"][0]["text"] == "Summary of our conversation so far: First four turns."
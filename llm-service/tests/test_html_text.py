@@ -0,0 +1,47 @@
+from app.services.html_text import extract_visible_text
+
+
+def test_keeps_header_inside_article():
+    html = """
+    <html><body>
+      <header><a href="/">Cain's Ballroom</a> Tickets Calendar</header>
+      <nav>Home | Shows | Contact</nav>
+      <article>
+        <header><h1>Jazz Night</h1><time>Fri 8pm</time></header>
+        <p>At Cain's Ballroom. $20</p>
+      </article>
+      <footer>Copyright 2024</footer>
+    </body></html>
+    """
+
+    text = extract_visible_text(html)
+
+    assert text.splitlines() == ["Jazz Night", "Fri 8pm", "At Cain's Ballroom. $20"]
+
+
+def test_keeps_landmarks_inside_main():
+    html = """
+    <body>
+      <nav>Menu</nav>
+      <main><aside>Doors 7pm</aside><p>Blues on the Green</p></main>
+    </body>
+    """
+
+    text = extract_visible_text(html)
+
+    assert "Doors 7pm" in text
+    assert "Blues on the Green" in text
+    assert "Menu" not in text
+
+
+def test_drops_scripts_and_keeps_json_ld():
+    html = """
+    <head><script type="application/ld+json">{"@type": "Event", "name": "Rodeo"}</script></head>
+    <body><script>track()</script><style>p {}</style><p>Rodeo Saturday</p></body>
+    """
+
+    text = extract_visible_text(html)
+
+    assert text.startswith('{"@type": "Event", "name": "Rodeo"}')
+    assert "track()" not in text
+    assert text.endswith("Rodeo Saturday")
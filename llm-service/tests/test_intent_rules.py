@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.intent_rules import match_intent
+
+# 2024-06-03 is a Monday
+MONDAY = date(2024, 6, 3)
+SATURDAY = date(2024, 6, 8)
+SUNDAY = date(2024, 6, 9)
+
+
+def params(**values):
+    base = {
+        "query": None, "category": None, "date_from": None, "date_to": None,
+        "location": None, "price_max": None, "outdoor": None, "family_friendly": None,
+    }
+    base.update(values)
+    return base
+
+
+def test_topic_and_date():
+    assert match_intent("Any jazz tonight?", MONDAY) == params(
+        category="concerts", query="jazz", date_from="2024-06-03", date_to="2024-06-03"
+    )
+
+
+def test_tomorrow():
+    assert match_intent("comedy shows tomorrow", MONDAY) == params(
+        category="comedy", date_from="2024-06-04", date_to="2024-06-04"
+    )
+
+
+@pytest.mark.parametrize("offset", range(5))
+def test_this_weekend_on_a_weekday_is_the_coming_saturday_and_sunday(offset):
+    today = MONDAY + timedelta(days=offset)
+
+    result = match_intent("events this weekend", today)
+
+    assert (result["date_from"], result["date_to"]) == ("2024-06-08", "2024-06-09")
+
+
+def test_this_weekend_on_saturday_is_today_and_tomorrow():
+    result = match_intent("events this weekend", SATURDAY)
+
+    assert (result["date_from"], result["date_to"]) == ("2024-06-08", "2024-06-09")
+
+
+def test_this_weekend_on_sunday_is_just_today():
+    result = match_intent("events this weekend", SUNDAY)
+
+    assert (result["date_from"], result["date_to"]) == ("2024-06-09", "2024-06-09")
+
+
+def test_location_family_outdoor():
+    assert match_intent("Kid-friendly outdoor stuff in Broken Arrow", MONDAY) == params(
+        location="Broken Arrow", family_friendly=True, outdoor=True
+    )
+
+
+def test_longest_phrase_wins():
+    assert match_intent("food trucks downtown", MONDAY) == params(query="food trucks", location="Downtown")
+
+
+@pytest.mark.parametrize("message, price_max", [
+    ("free concerts", 0.0),
+    ("concerts under $20", 20.0),
+    ("comedy less than 15.50", 15.5),
+])
+def test_price(message, price_max):
+    assert match_intent(message, MONDAY)["price_max"] == price_max
+
+
+@pytest.mark.parametrize("message", [
+    # Unaccounted-for words go to Gemini
+    "jazz near the river with parking",
+    "concerts for my anniversary",
+    # Only filler
+    "what's happening",
+    "",
+    # A pattern matching twice is more than the rules can express
+    "jazz or blues tonight",
+    "concerts tonight or tomorrow",
+    "downtown or brookside",
+    # Contradictory price
+    "free outdoor concerts under $20",
+])
+def test_falls_through_to_gemini(message):
+    assert match_intent(message, MONDAY) is None
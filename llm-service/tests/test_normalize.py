@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from app.services import gemini
+
+URL = "https://cainsballroom.com/events"
+JAZZ = {"title": "Jazz Night", "start_time": "2024-06-07T20:00:00-05:00"}
+
+
+def normalize(html="<main><p>Jazz Night, Fri 8pm</p></main>"):
+    return asyncio.run(gemini.normalize_events(html, URL))
+
+
+def test_events_get_their_source_url(gemini_stub):
+    gemini_stub.reply_json([JAZZ])
+
+    assert normalize() == [{**JAZZ, "source_url": URL}]
+
+
+@pytest.mark.parametrize("reply", [{"events": [JAZZ]}, JAZZ, [JAZZ, None, "Jazz Night", 3, {"venue": "Cain's"}]])
+def test_reply_shapes_are_normalized_to_a_list_of_events(gemini_stub, reply):
+    gemini_stub.reply_json(reply)
+
+    assert normalize() == [{**JAZZ, "source_url": URL}]
+
+
+@pytest.mark.parametrize("reply", ["Jazz Night", 42, None])
+def test_non_event_replies_raise_and_are_not_cached(gemini_stub, reply):
+    gemini_stub.reply_json(reply)
+    gemini_stub.reply_json([JAZZ])
+
+    with pytest.raises(ValueError):
+        normalize()
+    assert normalize() == [{**JAZZ, "source_url": URL}]
+    assert len(gemini_stub.requests) == 2
+
+
+def test_results_are_cached(gemini_stub):
+    gemini_stub.reply_json([JAZZ])
+
+    normalize()
+    normalize()
+
+    assert len(gemini_stub.requests) == 1
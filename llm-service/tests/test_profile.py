@@ -0,0 +1,55 @@
+import asyncio
+
+from app.services import gemini
+from tests.conftest import text_part
+
+PROFILE = {
+    "user": {"name": "Sam", "family_friendly_only": True, "radius_miles": 1},
+    "preferences": [{"category": "concerts", "weight": 2}, {"category": "comedy", "weight": 1}],
+}
+
+
+def test_profile_key_round_trips():
+    key = gemini._profile_key(PROFILE)
+
+    hash(key)
+    assert gemini._thaw_profile_key(key) == PROFILE
+
+
+def test_profile_key_ignores_dict_order_but_not_list_order():
+    reordered = {"preferences": PROFILE["preferences"], "user": dict(reversed(list(PROFILE["user"].items())))}
+    swapped = {**PROFILE, "preferences": list(reversed(PROFILE["preferences"]))}
+
+    assert gemini._profile_key(reordered) == gemini._profile_key(PROFILE)
+    assert gemini._profile_key(swapped) != gemini._profile_key(PROFILE)
+
+
+def test_profile_key_keeps_true_distinct_from_one():
+    assert gemini._profile_key({"a": True}) != gemini._profile_key({"a": 1})
+    assert gemini._thaw_profile_key(gemini._profile_key({"a": True})) == {"a": True}
+
+
+def test_encoded_profile_is_stable():
+    reordered = {"preferences": PROFILE["preferences"], "user": PROFILE["user"]}
+
+    assert gemini._encode_profile(gemini._profile_key(reordered)) == gemini._encode_profile(
+        gemini._profile_key(PROFILE)
+    )
+
+
+def test_chat_without_profile_sends_no_preferences_turn(gemini_stub):
+    gemini_stub.reply(text_part("Hi!"))
+
+    asyncio.run(gemini.generate_chat_response("hello", []))
+
+    assert len(gemini_stub.requests[0]["contents"]) == 1
+
+
+def test_chat_with_profile_prefixes_it(gemini_stub):
+    gemini_stub.reply(text_part("Hi Sam!"))
+
+    asyncio.run(gemini.generate_chat_response("hello", [], user_profile=PROFILE))
+
+    contents = gemini_stub.requests[0]["contents"]
+    assert len(contents) == 3
+    assert contents[0]["parts"][0]["text"].startswith('User preferences: {"preferences":')
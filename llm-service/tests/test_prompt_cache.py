@@ -0,0 +1,40 @@
+import asyncio
+
+from app.services import gemini
+from tests.conftest import call_part, text_part
+
+
+async def no_events(params):
+    return []
+
+
+def test_small_prefix_is_sent_inline_without_creating_a_cache(gemini_stub):
+    asyncio.run(gemini.create_prompt_cache())
+
+    assert gemini_stub.cache_requests == []
+    assert gemini._cached_chat_config is None
+
+
+def test_chat_uses_the_cache_but_the_results_follow_up_is_inline(gemini_stub, monkeypatch):
+    monkeypatch.setattr(gemini, "PROMPT_CACHE_MIN_TOKENS", 0)
+    gemini_stub.reply(call_part("search_events", {"query": "jazz"}))
+    gemini_stub.reply(text_part("Nothing this week, sorry!"))
+
+    async def main():
+        await gemini.create_prompt_cache()
+        try:
+            return await gemini.generate_chat_response("any jazz?", [], run_search=no_events)
+        finally:
+            await gemini.delete_prompt_cache()
+
+    result = asyncio.run(main())
+
+    assert result["reply"] == "Nothing this week, sorry!"
+    first, follow_up = gemini_stub.requests
+    assert first["cachedContent"] == gemini_stub.cache_name
+    assert "systemInstruction" not in first and "tools" not in first
+    assert "cachedContent" not in follow_up
+    assert follow_up["systemInstruction"]["parts"][0]["text"] == gemini.TULLY_PERSONA
+    assert follow_up["toolConfig"]["functionCallingConfig"]["mode"] == "NONE"
+    assert [method for method, _ in gemini_stub.cache_requests] == ["POST", "DELETE"]
+    assert gemini._cached_chat_config is None